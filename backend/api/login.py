@@ -3,6 +3,7 @@ import re
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from backend.services.cache import cache
 from backend.services.teable import db
 
 router = APIRouter(prefix="/api", tags=["auth"])
@@ -11,6 +12,40 @@ class LoginCredentials(BaseModel):
     email: str
     password: str
 
+
+# On an index miss, rebuild it at most this often (new accounts, changed emails)
+LOGIN_INDEX_REBUILD_SECONDS = 10
+
+
+def find_account(email: str) -> Optional[dict]:
+    """Look up Auth_Accounts by email.
+
+    The shared index only maps email -> record id; the account itself is
+    always fetched fresh, so password or status changes apply immediately.
+    """
+    entry = None
+    if cache.has_index("Auth_Accounts", "email"):
+        entry = cache.get_index("Auth_Accounts", "email", email)
+
+    if entry is None and not cache.has_index(
+        "Auth_Accounts", "email", max_age=LOGIN_INDEX_REBUILD_SECONDS
+    ):
+        accounts = db.scan_table("Auth_Accounts")
+        index = {}
+        for account_email, account_id in zip(accounts.column("email", ""), accounts.column("id")):
+            key = str(account_email or "").strip().lower()
+            if key and account_id and key not in index:
+                index[key] = {"id": account_id}
+        cache.set_index("Auth_Accounts", "email", index)
+        entry = index.get(email)
+
+    if entry is None:
+        return None
+    account = db.get_record("Auth_Accounts", entry["id"])
+    if not account or str(account.get("email", "")).strip().lower() != email:
+        return None
+    return account
+
 @router.post("/login")
 def login_pipeline(body: LoginCredentials):
     if not db.get_client():
@@ -20,12 +55,9 @@ def login_pipeline(body: LoginCredentials):
     password_input = body.password.strip()
 
     # Крок 1: Перевірка Credentials в Auth_Accounts
-    result = db.list_records(table="Auth_Accounts", full_list=True)
-    users = [u for u in result.get("items", []) if str(u.get("email", "")).strip().lower() == email]
-    
-    if not users:
+    user = find_account(email)
+    if not user:
         raise HTTPException(status_code=401, detail="Невірний email або пароль")
-    user = users[0]
 
     password_db = re.sub(r"<[^>]+>", "", str(user.get("password_hash", ""))).strip()
     if not hmac.compare_digest(password_db, password_input):
@@ -41,14 +73,16 @@ def login_pipeline(body: LoginCredentials):
     if role in ["Tech_Admin", "MF_Admin"]:
         available_centers = [{"id": "network", "name": "Мережевий Дашборд (Всі центри)"}]
     else:
-        access_records = db.list_records(table="Employee_LC_Access", full_list=True).get("items", [])
-        user_access = [a for a in access_records if a.get("employee_id") == user["id"]]
+        user_access = db.scan_table("Employee_LC_Access").filter(
+            [{"field": "employee_id", "op": "eq", "value": user["id"]}]
+        ).to_dicts()
         
-        lc_records = db.list_records(table="Learning_Centres", full_list=True).get("items", [])
+        lc_records = db.scan_table("Learning_Centres")
         
         available_centers = []
         for access in user_access:
-            lc = next((l for l in lc_records if l["id"] == access["lc_id"]), None)
+            matched = lc_records.filter([{"field": "id", "op": "eq", "value": access["lc_id"]}])
+            lc = matched.row(0) if len(matched) else None
             if lc and lc.get("status") != "frozen":
                 available_centers.append({
                     "id": lc["id"], 
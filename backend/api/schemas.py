@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional, List, Any
 
 # --- Базова конфігурація ---
@@ -10,6 +10,25 @@ class BaseSchema(BaseModel):
         extra='ignore'          
     )
 
+# --- Вкладення (attachment-поле Teable) ---
+class AttachmentSchema(BaseSchema):
+    name: Optional[str] = ""
+    token: Optional[str] = None
+    path: Optional[str] = None
+    url: Optional[str] = None
+    presignedUrl: Optional[str] = None
+    mimetype: Optional[str] = None
+    size: Optional[int] = None
+
+
+def attachments_from_cell(value: Any) -> Any:
+    # Порожнє значення -> [], старий рядок з url -> одне вкладення
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return [{"url": value}]
+    return value
+
 # --- 1. Схема для Навчальних Центрів (lc) ---
 class LCSchema(BaseSchema):
     id: str
@@ -35,11 +54,13 @@ class StaffSchema(BaseSchema):
     
     center_id: Optional[str] = Field(default=None, alias="lc_id") 
     
-    avatar: Optional[str] = Field(default="")
+    avatar: List[AttachmentSchema] = Field(default_factory=list)
     
     created: Optional[str] = Field(default="")
     updated: Optional[str] = Field(default="")
 
+    _avatar_cell = field_validator("avatar", mode="before")(attachments_from_cell)
+
 # --- 3. Схема для Реєстрацій (reg) ---
 class RegSchema(BaseSchema):
     id: str
@@ -1,10 +1,14 @@
 from typing import Any, Dict, List, Optional, Type
 
-from fastapi import APIRouter, File, Form, HTTPException, Query as FastQuery, UploadFile
+from fastapi import APIRouter, HTTPException, Query as FastQuery, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.datastructures import UploadFile
 
 from backend.environment import settings
-from backend.services.teable import db
+from backend.services.events import feed
+from backend.services.teable import UploadTooLargeError, db
 
 from .schemas import (
     BaseSchema,
@@ -32,6 +36,9 @@ TABLE_SCHEMAS: Dict[str, Type[BaseSchema]] = {
 
 BASE_QUERY_FIELDS = {"id", "created", "updated"}
 
+# Room for multipart boundaries, part headers and the "field" value on top of the file itself
+UPLOAD_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
 
 class CRUDPayload(BaseModel):
     data: Dict[str, Any]
@@ -147,6 +154,24 @@ def pb_get(
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@router.get("/pb/{table}/events")
+async def pb_events(table: str):
+    """SSE stream of create/update/delete deltas for a table."""
+    if not db.get_client():
+        raise HTTPException(status_code=503, detail="Teable service unavailable")
+
+    schema_class = resolve_schema(table)
+
+    def to_schema(row: Dict[str, Any]) -> Dict[str, Any]:
+        return schema_class.model_validate(row).model_dump(by_alias=False)
+
+    return StreamingResponse(
+        feed.subscribe(table, db.scan_table, to_schema),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/pb/{table}")
 def pb_create(table: str, payload: CRUDPayload):
     if not db.get_client():
@@ -156,6 +181,7 @@ def pb_create(table: str, payload: CRUDPayload):
 
     try:
         record = db.create_record(table, payload.data)
+        feed.publish(table, "create", str(record.get("id")), record)
         return schema_class.model_validate(record).model_dump(by_alias=False)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -170,6 +196,7 @@ def pb_update(table: str, record_id: str, payload: CRUDPayload):
 
     try:
         record = db.update_record(table, record_id, payload.data)
+        feed.publish(table, "update", record_id, record)
         return schema_class.model_validate(record).model_dump(by_alias=False)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -184,36 +211,93 @@ def pb_delete(table: str, record_id: str):
 
     try:
         db.delete_record(table, record_id)
+        feed.publish(table, "delete", record_id)
         return {"status": "ok", "id": record_id}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/pb/{table}/{record_id}/file")
-async def pb_upload_file(
+def store_upload(
     table: str,
     record_id: str,
-    field: str = Form(...),
-    file: UploadFile = File(...),
-):
+    field: str,
+    file: UploadFile,
+    schema_class: Type[BaseSchema],
+) -> Dict[str, Any]:
+    # Upload body is spooled to disk by Starlette; stream it to Teable in chunks.
+    try:
+        uploaded = db.upload_file(
+            file.filename or "upload.bin",
+            file.file,
+            content_type=file.content_type,
+            max_bytes=settings.TEABLE_MAX_UPLOAD_BYTES,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Teable upload failed: {str(e)}")
+
+    try:
+        record = db.update_record(table, record_id, {field: [uploaded]})
+        feed.publish(table, "update", record_id, record)
+        return schema_class.model_validate(record).model_dump(by_alias=False)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# The form is parsed by hand (after the Content-Length check), so describe it for OpenAPI explicitly
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["field", "file"],
+                    "properties": {
+                        "field": {"type": "string", "description": "Attachment field to link the file to"},
+                        "file": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("/pb/{table}/{record_id}/file", openapi_extra=UPLOAD_OPENAPI)
+async def pb_upload_file(table: str, record_id: str, request: Request):
+    """Multipart upload with form fields ``field`` and ``file``."""
     if not db.get_client():
         raise HTTPException(status_code=503, detail="Teable service unavailable")
 
     schema_class = resolve_schema(table)
-    allowed_fields = allowed_query_fields(schema_class)
-    if field not in allowed_fields:
-        raise HTTPException(status_code=400, detail=f"File field '{field}' is not allowed")
 
-    content = await file.read()
-    if len(content) > settings.TEABLE_MAX_UPLOAD_BYTES:
+    # Reject oversized bodies before the multipart parser spools them to disk
+    content_length = request.headers.get("content-length")
+    if content_length is None:
+        raise HTTPException(status_code=411, detail="Content-Length header is required")
+    try:
+        body_size = int(content_length)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if body_size > settings.TEABLE_MAX_UPLOAD_BYTES + UPLOAD_MULTIPART_OVERHEAD_BYTES:
         raise HTTPException(
             status_code=413,
             detail=f"File is too large. Max allowed is {settings.TEABLE_MAX_UPLOAD_BYTES} bytes",
         )
 
+    form = await request.form(max_files=1, max_fields=1)
     try:
-        uploaded = db.upload_file(file.filename or "upload.bin", content)
-        record = db.update_record(table, record_id, {field: uploaded.get("url") or uploaded.get("token")})
-        return schema_class.model_validate(record).model_dump(by_alias=False)
-    except Exception as e:
-        raise HTTPException(status_code=501, detail=f"Upload integration pending: {str(e)}")
+        field = form.get("field")
+        file = form.get("file")
+        if not isinstance(field, str) or not isinstance(file, UploadFile):
+            raise HTTPException(status_code=422, detail="Form fields 'field' and 'file' are required")
+
+        allowed_fields = allowed_query_fields(schema_class)
+        if field not in allowed_fields:
+            raise HTTPException(status_code=400, detail=f"File field '{field}' is not allowed")
+
+        return await run_in_threadpool(store_upload, table, record_id, field, file, schema_class)
+    finally:
+        await form.close()
@@ -10,13 +10,29 @@ class Settings(BaseSettings):
     TEABLE_BASE_URL: str = os.getenv("TEABLE_BASE_URL", "https://app.teable.ai")
     TEABLE_API_TOKEN: str | None = os.getenv("TEABLE_API_TOKEN")
     TEABLE_TIMEOUT_SECONDS: float = float(os.getenv("TEABLE_TIMEOUT_SECONDS", "20"))
+    # Background (re)connect interval; doubles on each failure up to TEABLE_RECONNECT_MAX_SECONDS
+    TEABLE_RECONNECT_SECONDS: float = float(os.getenv("TEABLE_RECONNECT_SECONDS", "2"))
+    TEABLE_RECONNECT_MAX_SECONDS: float = float(os.getenv("TEABLE_RECONNECT_MAX_SECONDS", "60"))
 
     # Optional mapping for logical table name -> Teable table ID
     # Format: "lc:tblXXXX,user_staff:tblYYYY"
     TEABLE_TABLE_MAP_RAW: str = os.getenv("TEABLE_TABLE_MAP", "")
 
-    # Upload limits for /file endpoint (currently placeholder integration)
+    # Upload limits for /file endpoint
     TEABLE_MAX_UPLOAD_BYTES: int = int(os.getenv("TEABLE_MAX_UPLOAD_BYTES", "5242880"))  # 5MB
+    # Chunk size used when streaming attachments to Teable
+    TEABLE_UPLOAD_CHUNK_BYTES: int = int(os.getenv("TEABLE_UPLOAD_CHUNK_BYTES", "65536"))  # 64KB
+
+    # Shared cache for multi-worker mode (uvicorn --workers / WEB_CONCURRENCY).
+    # All workers read/write the same store under this directory.
+    TEABLE_DATA_DIR: str = os.getenv("TEABLE_DATA_DIR", "data")
+    # How long cached table scans, login indexes and the connection check stay fresh; 0 disables the cache
+    TEABLE_CACHE_TTL_SECONDS: float = float(os.getenv("TEABLE_CACHE_TTL_SECONDS", "60"))
+
+    # SSE change feed (/api/pb/{table}/events)
+    EVENTS_POLL_SECONDS: float = float(os.getenv("EVENTS_POLL_SECONDS", "10"))  # upstream change detection, 0 disables
+    EVENTS_KEEPALIVE_SECONDS: float = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+    EVENTS_QUEUE_SIZE: int = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))  # per client, slow clients get "resync"
 
     @property
     def TEABLE_TABLE_MAP(self) -> dict[str, str]:
@@ -2,7 +2,7 @@ import asyncio
 import os
 
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend.api.login import router as login_router
@@ -15,6 +15,42 @@ app.include_router(universal_router)
 app.include_router(login_router)
 
 
+async def teable_supervisor() -> None:
+    """Connect to Teable in the background, warm up the cache and reconnect on failure."""
+    delay = settings.TEABLE_RECONNECT_SECONDS
+    # A timed-out connect keeps running in its thread; never start a second one alongside it
+    pending_connect: asyncio.Future | None = None
+    while True:
+        if not db.is_authenticated:
+            if pending_connect is None:
+                pending_connect = asyncio.ensure_future(asyncio.to_thread(db.connect))
+            done, _ = await asyncio.wait({pending_connect}, timeout=settings.TEABLE_TIMEOUT_SECONDS)
+            if not done:
+                print("⚠️ Timeout підключення до Teable, повторимо пізніше")
+            else:
+                error = pending_connect.exception()
+                pending_connect = None
+                if error is not None:
+                    print(f"❌ Помилка при підключенні до Teable: {error}")
+
+            if db.is_authenticated:
+                print("✅ Teable статус: підключено")
+                delay = settings.TEABLE_RECONNECT_SECONDS
+            else:
+                delay = min(delay * 2, settings.TEABLE_RECONNECT_MAX_SECONDS)
+
+        if db.is_authenticated and not db.is_warm:
+            # Warm-up: preload mapped tables into the shared cache before reporting ready
+            try:
+                await asyncio.to_thread(db.warm_up)
+                if db.is_warm:
+                    print("✅ Warm-up кешу завершено")
+            except Exception as e:
+                print(f"⚠️ Warm-up кешу не вдався: {e}")
+
+        await asyncio.sleep(delay)
+
+
 @app.on_event("startup")
 async def startup_event():
     print("🚀 Startup event викликано")
@@ -25,28 +61,51 @@ async def startup_event():
     }
     missing = [key for key, value in required.items() if not value]
     if missing:
-        print(f"⚠️ Відсутні env для Teable: {', '.join(missing)}")
+        print(f"⚠️ Відсутні env для Teable: {', '.join(missing)}, API працює без БД")
+        return
+
+    # Do not block readiness of the app on Teable: connect lazily in the background
+    app.state.teable_task = asyncio.create_task(teable_supervisor())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    task = getattr(app.state, "teable_task", None)
+    if task is not None:
+        task.cancel()
+    db.close()
 
-    try:
-        await asyncio.wait_for(asyncio.to_thread(db.connect), timeout=10.0)
-        print(
-            f"✅ Teable статус: "
-            f"{'підключено' if db.is_authenticated else 'не підключено, але API працює'}"
-        )
-    except asyncio.TimeoutError:
-        print("⚠️ Timeout підключення до Teable, продовжуємо без БД")
-    except Exception as e:
-        print(f"❌ Помилка при підключенні до Teable: {e}")
+
+def is_ready() -> bool:
+    return db.is_authenticated and db.is_warm
 
 
 @app.get("/api/health")
 async def health_check():
+    """Liveness: the process is up. Readiness is reported alongside."""
     return {
         "status": "ok",
         "message": "API is running",
+        "live": True,
+        "ready": is_ready(),
         "database_connected": db.is_authenticated,
         "database_provider": "teable",
+        "worker_pid": os.getpid(),
+    }
+
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness: Teable is connected and the cache is warmed up."""
+    body = {
+        "status": "ready" if is_ready() else "not_ready",
+        "database_connected": db.is_authenticated,
+        "cache_warm": db.is_warm,
+        "worker_pid": os.getpid(),
     }
+    if not is_ready():
+        return JSONResponse(status_code=503, content=body)
+    return body
 
 
 # Serve static files from frontend/dist
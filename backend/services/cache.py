@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from backend.environment import settings
+from backend.services.rows import RowSet
+
+
+class SharedCache:
+    """Table/index cache shared by all uvicorn workers.
+
+    Backed by a SQLite file under TEABLE_DATA_DIR, so every worker process on
+    the host sees the same scans, login indexes and connection state.
+    Each worker keeps a decoded copy of a table and only re-reads it from
+    disk when the shared version changes.
+    """
+
+    def __init__(self, data_dir: str, ttl_seconds: float) -> None:
+        self.data_dir = data_dir
+        self.ttl_seconds = ttl_seconds
+        self.path = os.path.join(data_dir, "teable_cache.sqlite3")
+        self._local = threading.local()
+        self._decoded: Dict[str, Tuple[int, RowSet]] = {}
+        # with the cache disabled, write generations are only tracked in-process
+        self._generations: Dict[str, int] = {}
+        self._schema_ready = False
+        self._process_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS table_cache (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    rows TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS table_index (
+                    tbl TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    PRIMARY KEY (tbl, name, key)
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                """
+            )
+            self._schema_ready = True
+        self._local.conn = conn
+        return conn
+
+    # --- table scans ---
+
+    def get_table(self, table: str) -> Optional[RowSet]:
+        if not self.enabled:
+            return None
+
+        row = self._conn().execute(
+            "SELECT version, stored_at FROM table_cache WHERE name = ?", (table,)
+        ).fetchone()
+        if row is None:
+            # invalidated (possibly by another worker): don't keep a stale copy in memory
+            self._decoded.pop(table, None)
+            return None
+
+        version, stored_at = row
+        if time.time() - stored_at > self.ttl_seconds:
+            self._decoded.pop(table, None)
+            return None
+
+        decoded = self._decoded.get(table)
+        if decoded and decoded[0] == version:
+            return decoded[1]
+
+        # version changed: release the old copy before decoding the new one
+        self._decoded.pop(table, None)
+        raw = self._conn().execute(
+            "SELECT rows FROM table_cache WHERE name = ? AND version = ?", (table, version)
+        ).fetchone()
+        if raw is None:
+            return None
+        rows = RowSet.from_payload(json.loads(raw[0]))
+        self._decoded[table] = (version, rows)
+        return rows
+
+    def generation(self, table: str) -> int:
+        """Counter bumped by every invalidate(); read it before a scan and pass it to set_table."""
+        if not self.enabled:
+            return self._generations.get(table, 0)
+        value = self.get_meta(f"gen:{table}")
+        return int(value) if value else 0
+
+    def set_table(self, table: str, rows: RowSet, generation: Optional[int] = None) -> bool:
+        """Store a scan; skipped (returns False) if the table was written to since ``generation``."""
+        if not self.enabled:
+            return False
+
+        version = time.time_ns()
+        with self._transaction() as conn:
+            if generation is not None:
+                current = conn.execute("SELECT value FROM meta WHERE key = ?", (f"gen:{table}",)).fetchone()
+                if (int(current[0]) if current else 0) != generation:
+                    return False
+            conn.execute(
+                "INSERT OR REPLACE INTO table_cache (name, version, stored_at, rows) VALUES (?, ?, ?, ?)",
+                (table, version, time.time(), json.dumps(rows.to_payload(), default=str)),
+            )
+            self._drop_indexes(conn, table)
+        self._decoded[table] = (version, rows)
+        return True
+
+    def invalidate(self, table: str) -> None:
+        """Drop a table after a write. Best-effort: the write itself already succeeded."""
+        self._decoded.pop(table, None)
+        if not self.enabled:
+            # generation is still needed by the change feed
+            self._generations[table] = self._generations.get(table, 0) + 1
+            return
+
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM table_cache WHERE name = ?", (table,))
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, '1') "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+                    (f"gen:{table}",),
+                )
+                self._drop_indexes(conn, table)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ Cache invalidation for table '{table}' failed: {e}")
+
+    # --- lookup indexes (e.g. login by email) ---
+
+    def has_index(self, table: str, name: str, max_age: Optional[float] = None) -> bool:
+        if not self.enabled:
+            return False
+        built_at = self.get_meta(f"index:{table}:{name}")
+        limit = self.ttl_seconds if max_age is None else max_age
+        return built_at is not None and time.time() - float(built_at) <= limit
+
+    def get_index(self, table: str, name: str, key: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT record FROM table_index WHERE tbl = ? AND name = ? AND key = ?",
+            (table, name, key),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_index(self, table: str, name: str, mapping: Dict[str, Dict[str, Any]]) -> None:
+        if not self.enabled:
+            return
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM table_index WHERE tbl = ? AND name = ?", (table, name))
+            conn.executemany(
+                "INSERT OR REPLACE INTO table_index (tbl, name, key, record) VALUES (?, ?, ?, ?)",
+                [(table, name, key, json.dumps(record, default=str)) for key, record in mapping.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (f"index:{table}:{name}", str(time.time())),
+            )
+
+    # --- small shared state ---
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._conn().execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @contextmanager
+    def exclusive(self, name: str) -> Iterator[None]:
+        """Cross-process lock, used so only one worker runs the warm-up."""
+        try:
+            import fcntl
+        except ImportError:
+            # non-POSIX dev machines: lock within this process only
+            with self._process_lock:
+                yield
+            return
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(os.path.join(self.data_dir, f"{name}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _drop_indexes(conn: sqlite3.Connection, table: str) -> None:
+        conn.execute("DELETE FROM table_index WHERE tbl = ?", (table,))
+        conn.execute("DELETE FROM meta WHERE key LIKE ?", (f"index:{table}:%",))
+
+
+# Global singleton shared by TeableDB and routers
+cache = SharedCache(settings.TEABLE_DATA_DIR, settings.TEABLE_CACHE_TTL_SECONDS)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from backend.environment import settings
+from backend.services.cache import cache
+from backend.services.rows import RowSet
+
+Row = Dict[str, Any]
+Loader = Callable[[str], RowSet]
+Mapper = Callable[[Row], Row]
+
+
+class Subscription:
+    """One SSE client. Receives pre-encoded event frames from the feed."""
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=queue_size)
+        self.lagged = False
+
+    def offer(self, frame: bytes) -> None:
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # slow client: tell it to reload and drop it instead of buffering without limit
+            self.lagged = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class ChangeFeed:
+    """Fan-out of create/update/delete deltas per table to SSE subscribers.
+
+    Each delta is encoded once and the same frame is queued for every
+    subscriber. Writes made through this worker are published directly;
+    a single watcher task per subscribed table also diffs table scans to
+    pick up changes made by other workers or in Teable itself.
+    """
+
+    def __init__(self, queue_size: int, poll_seconds: float) -> None:
+        self.queue_size = queue_size
+        self.poll_seconds = poll_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._watchers: Dict[str, asyncio.Task] = {}
+        self._mappers: Dict[str, Mapper] = {}
+        self._known: Dict[str, Dict[str, str]] = {}
+        # per-table count of locally published writes, read on the loop thread only
+        self._published: Dict[str, int] = {}
+        self._seq = 0
+
+    def publish(self, table: str, event_type: str, record_id: str, row: Optional[Row] = None) -> None:
+        """Announce a write. Thread-safe: called from sync routes running in the threadpool.
+
+        ``row`` is the flat Teable row; it is mapped through the table schema
+        only if someone is subscribed.
+        """
+        loop = self._loop
+        if loop is None or not self._subscribers.get(table):
+            return
+        fingerprint = self._fingerprint(row) if row is not None else None
+        loop.call_soon_threadsafe(self._dispatch_published, table, event_type, record_id, row, fingerprint)
+
+    async def subscribe(self, table: str, loader: Loader, mapper: Mapper) -> AsyncIterator[bytes]:
+        """Yield SSE frames for ``table`` until the client goes away."""
+        self._loop = asyncio.get_running_loop()
+        sub = Subscription(self.queue_size)
+        self._subscribers.setdefault(table, set()).add(sub)
+        self._mappers[table] = mapper
+        if table not in self._watchers and self.poll_seconds > 0:
+            self._watchers[table] = asyncio.create_task(self._watch(table, loader))
+
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(sub.queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if frame is None:
+                    yield self._encode(table, "resync", "", None)
+                    return
+                yield frame
+        finally:
+            self._unsubscribe(table, sub)
+
+    def _unsubscribe(self, table: str, sub: Subscription) -> None:
+        subs = self._subscribers.get(table)
+        if subs is None:
+            return
+        subs.discard(sub)
+        if not subs:
+            del self._subscribers[table]
+            self._mappers.pop(table, None)
+            self._known.pop(table, None)
+            self._published.pop(table, None)
+            watcher = self._watchers.pop(table, None)
+            if watcher is not None:
+                watcher.cancel()
+
+    def _dispatch_published(
+        self,
+        table: str,
+        event_type: str,
+        record_id: str,
+        row: Optional[Row],
+        fingerprint: Optional[str],
+    ) -> None:
+        self._published[table] = self._published.get(table, 0) + 1
+        self._dispatch(table, event_type, record_id, row, fingerprint)
+
+    def _dispatch(
+        self,
+        table: str,
+        event_type: str,
+        record_id: str,
+        row: Optional[Row],
+        fingerprint: Optional[str],
+    ) -> None:
+        subs = self._subscribers.get(table)
+        if not subs:
+            return
+
+        known = self._known.get(table)
+        if known is not None:
+            # keep the watcher's snapshot in sync so it does not re-announce our own writes
+            if event_type == "delete":
+                known.pop(record_id, None)
+            elif fingerprint is not None:
+                known[record_id] = fingerprint
+
+        record = None
+        if row is not None:
+            try:
+                record = self._mappers[table](row)
+            except Exception:
+                return
+
+        frame = self._encode(table, event_type, record_id, record)
+        for sub in list(subs):
+            sub.offer(frame)
+
+    async def _watch(self, table: str, loader: Loader) -> None:
+        last_rows: Optional[RowSet] = None
+        while True:
+            published = self._published.get(table, 0)
+            try:
+                generation = await asyncio.to_thread(cache.generation, table)
+                rows = await asyncio.to_thread(loader, table)
+            except Exception as e:
+                print(f"⚠️ Change feed for '{table}' failed to load: {e}")
+                await asyncio.sleep(self.poll_seconds)
+                continue
+
+            # same cached scan as last time: nothing changed
+            if rows is not last_rows:
+                current = await asyncio.to_thread(self._snapshot, rows)
+                generation_changed = await asyncio.to_thread(cache.generation, table) != generation
+                if generation_changed or self._published.get(table, 0) != published:
+                    # a write landed while loading, so this scan may predate it (and our own
+                    # published delta); diffing it would emit a spurious delete. Retry next tick.
+                    await asyncio.sleep(self.poll_seconds)
+                    continue
+                known = self._known.get(table)
+                if known is None:
+                    self._known[table] = {rid: fp for rid, (fp, _) in current.items()}
+                else:
+                    for rid, (fp, i) in current.items():
+                        previous = known.get(rid)
+                        if previous != fp:
+                            event_type = "create" if previous is None else "update"
+                            self._dispatch(table, event_type, rid, rows.row(i), fp)
+                    for rid in [rid for rid in known if rid not in current]:
+                        self._dispatch(table, "delete", rid, None, None)
+                last_rows = rows
+
+            await asyncio.sleep(self.poll_seconds)
+
+    @classmethod
+    def _snapshot(cls, rows: RowSet) -> Dict[str, Tuple[str, int]]:
+        # id -> (fingerprint, position); rows are materialized one at a time
+        return {
+            str(row["id"]): (cls._fingerprint(row), i)
+            for i, row in enumerate(rows.iter_dicts())
+            if row.get("id")
+        }
+
+    @staticmethod
+    def _fingerprint(row: Row) -> str:
+        payload = json.dumps(row, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _encode(self, table: str, event_type: str, record_id: str, record: Optional[Row]) -> bytes:
+        self._seq += 1
+        data = json.dumps(
+            {"type": event_type, "table": table, "id": record_id, "record": record},
+            default=str,
+        )
+        return f"id: {self._seq}\nevent: {event_type}\ndata: {data}\n\n".encode()
+
+
+# Global singleton used by API routers
+feed = ChangeFeed(settings.EVENTS_QUEUE_SIZE, settings.EVENTS_POLL_SECONDS)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+Cells = Iterable[Tuple[str, Any]]
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+# Marks a cell whose row has no such field (distinct from an explicit None)
+MISSING: Any = _Missing()
+
+# Short repeated strings (statuses, lc_id, roles...) are stored once per scan
+_POOL_MAX_LEN = 64
+
+
+class RowSet:
+    """Read-only columnar storage for a scanned table.
+
+    Values are kept column by column and shared between all views; filter,
+    sort and slicing only produce a new array of row positions. Rows are
+    turned into dicts only when a page is returned (``to_dicts``).
+    """
+
+    __slots__ = ("_columns", "_size", "_index")
+
+    def __init__(
+        self,
+        columns: Optional[Dict[str, List[Any]]] = None,
+        size: int = 0,
+        index: Optional[array] = None,
+    ) -> None:
+        self._columns: Dict[str, List[Any]] = columns if columns is not None else {}
+        self._size = size
+        self._index = index
+
+    # --- building ---
+
+    @classmethod
+    def from_cells(cls, rows: Iterable[Cells]) -> "RowSet":
+        """Build from rows given as (field, value) pairs; later pairs override earlier ones."""
+        columns: Dict[str, List[Any]] = {}
+        pool: Dict[str, str] = {}
+        size = 0
+
+        for cells in rows:
+            for key, value in cells:
+                if type(value) is str and len(value) <= _POOL_MAX_LEN:
+                    value = pool.setdefault(value, value)
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [MISSING] * size
+                if len(column) > size:
+                    column[size] = value
+                else:
+                    column.append(value)
+            size += 1
+            for column in columns.values():
+                if len(column) < size:
+                    column.append(MISSING)
+
+        return cls(columns, size)
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]]) -> "RowSet":
+        return cls.from_cells(row.items() for row in rows)
+
+    # --- serialization for the shared cache ---
+
+    def to_payload(self) -> Dict[str, Any]:
+        fields = list(self._columns)
+        columns = []
+        missing = []
+        for field in fields:
+            values = self.column(field, default=MISSING)
+            holes = [pos for pos, value in enumerate(values) if value is MISSING]
+            for pos in holes:
+                values[pos] = None
+            columns.append(values)
+            missing.append(holes)
+        return {"size": len(self), "fields": fields, "columns": columns, "missing": missing}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "RowSet":
+        # json.loads gives every repeated string its own copy: pool them like from_cells
+        columns: Dict[str, List[Any]] = {}
+        pool: Dict[str, str] = {}
+        for field, values, holes in zip(payload["fields"], payload["columns"], payload["missing"]):
+            for pos, value in enumerate(values):
+                if type(value) is str and len(value) <= _POOL_MAX_LEN:
+                    values[pos] = pool.setdefault(value, value)
+            for pos in holes:
+                values[pos] = MISSING
+            columns[field] = values
+        return cls(columns, payload["size"])
+
+    # --- views ---
+
+    def __len__(self) -> int:
+        return self._size if self._index is None else len(self._index)
+
+    def positions(self) -> Iterable[int]:
+        return range(self._size) if self._index is None else self._index
+
+    def _view(self, positions: Iterable[int]) -> "RowSet":
+        return RowSet(self._columns, self._size, array("I", positions))
+
+    def __getitem__(self, item: slice) -> "RowSet":
+        if not isinstance(item, slice):
+            raise TypeError("RowSet supports slicing only; use row() for a single row")
+        if self._index is None:
+            return self._view(range(self._size)[item])
+        return RowSet(self._columns, self._size, self._index[item])
+
+    def column(self, field: str, default: Any = None) -> List[Any]:
+        """Values of ``field`` in view order; missing cells become ``default``."""
+        column = self._columns.get(field)
+        if column is None:
+            return [default] * len(self)
+        values = [column[pos] for pos in self.positions()]
+        if default is not MISSING:
+            values = [default if value is MISSING else value for value in values]
+        return values
+
+    def filter(self, filters: Optional[List[Dict[str, Any]]]) -> "RowSet":
+        if not filters:
+            return self
+
+        positions: Iterable[int] = self.positions()
+        for item in filters:
+            column = self._columns.get(item["field"])
+            matches = _predicate(item["op"], item["value"])
+            if column is None:
+                positions = positions if matches(None) else []
+                continue
+            positions = [
+                pos for pos in positions
+                if matches(None if column[pos] is MISSING else column[pos])
+            ]
+        return self._view(positions)
+
+    def sort(self, sort: Optional[str]) -> "RowSet":
+        if not sort:
+            return self
+
+        reverse = sort.startswith("-")
+        field = sort[1:] if reverse else sort
+        column = self._columns.get(field)
+        if column is None:
+            return self
+
+        def key(pos: int) -> Tuple[bool, Any]:
+            value = column[pos]
+            if value is MISSING:
+                value = None
+            return value is None, value
+
+        return self._view(sorted(self.positions(), key=key, reverse=reverse))
+
+    # --- materialization ---
+
+    def _row_at(self, pos: int) -> Dict[str, Any]:
+        return {
+            field: column[pos]
+            for field, column in self._columns.items()
+            if column[pos] is not MISSING
+        }
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """The i-th row of this view as a new dict."""
+        return self._row_at(i if self._index is None else self._index[i])
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        for pos in self.positions():
+            yield self._row_at(pos)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self.iter_dicts())
+
+
+def _predicate(op: str, target: Any) -> Callable[[Any], bool]:
+    if op == "eq":
+        return lambda value: value == target
+    if op == "neq":
+        return lambda value: value != target
+    if op == "gt":
+        return lambda value: value is not None and value > target
+    if op == "lt":
+        return lambda value: value is not None and value < target
+    if op == "gte":
+        return lambda value: value is not None and value >= target
+    if op == "lte":
+        return lambda value: value is not None and value <= target
+    if op == "like":
+        target_s = str(target)
+        return lambda value: value is not None and target_s in str(value)
+    if op == "ilike":
+        target_s = str(target).lower()
+        return lambda value: value is not None and target_s in str(value).lower()
+    return lambda value: True
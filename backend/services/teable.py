@@ -1,10 +1,31 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
-
-import httpx
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 from backend.environment import settings
+from backend.services.cache import cache
+from backend.services.rows import RowSet
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# Tables holding credentials are never written to the shared on-disk cache
+UNCACHED_TABLES = frozenset({"Auth_Accounts"})
+
+# Warm-up attempts per table before it is skipped so it can't block readiness forever
+WARM_UP_MAX_ATTEMPTS = 3
+
+
+class UploadTooLargeError(RuntimeError):
+    """Raised when an attachment exceeds TEABLE_MAX_UPLOAD_BYTES."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"File is too large. Max allowed is {max_bytes} bytes")
+        self.max_bytes = max_bytes
 
 
 class TeableDB:
@@ -14,6 +35,10 @@ class TeableDB:
         self.base_url: Optional[str] = settings.TEABLE_BASE_URL
         self.token: Optional[str] = settings.TEABLE_API_TOKEN
         self.is_authenticated: bool = False
+        self.is_warm: bool = False
+        self._warm_up_failures: Dict[str, int] = {}
+        self._client: Optional[httpx.Client] = None
+        self._client_lock = threading.Lock()
 
     def connect(self) -> None:
         self.base_url = settings.TEABLE_BASE_URL
@@ -23,10 +48,63 @@ class TeableDB:
             self.is_authenticated = False
             return
 
-        # smoke check
-        self._request("GET", "/api/auth/user")
+        # smoke check, shared between workers: skip it if another worker passed it recently
+        checked_at = cache.get_meta("teable_connected_at") if cache.enabled else None
+        if checked_at is None or time.time() - float(checked_at) > cache.ttl_seconds:
+            self.is_authenticated = False
+            self._request("GET", "/api/auth/user")
+            if cache.enabled:
+                cache.set_meta("teable_connected_at", str(time.time()))
         self.is_authenticated = True
 
+    def mark_disconnected(self) -> None:
+        """Drop the connection state so the background supervisor reconnects."""
+        self.is_authenticated = False
+        if cache.enabled:
+            cache.set_meta("teable_connected_at", "0")
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def warm_up(self) -> None:
+        """Preload mapped tables into the shared cache.
+
+        Runs under a cross-process lock, so with several workers only the first
+        one fetches from Teable and the rest find the cache already filled.
+        Stays not warm while any table fails, so the supervisor retries; a table
+        failing WARM_UP_MAX_ATTEMPTS times is skipped.
+        """
+        if not self.is_authenticated:
+            return
+        if not cache.enabled:
+            self.is_warm = True
+            return
+
+        with cache.exclusive("warmup"):
+            for table in UNCACHED_TABLES:
+                # drop copies stored by older versions
+                cache.invalidate(table)
+            pending = False
+            for table in settings.TEABLE_TABLE_MAP:
+                if table in UNCACHED_TABLES or cache.get_table(table) is not None:
+                    continue
+                attempts = self._warm_up_failures.get(table, 0)
+                if attempts >= WARM_UP_MAX_ATTEMPTS:
+                    continue
+                try:
+                    self.scan_table(table)
+                except Exception as e:
+                    attempts += 1
+                    self._warm_up_failures[table] = attempts
+                    if attempts >= WARM_UP_MAX_ATTEMPTS:
+                        print(f"❌ Warm-up for table '{table}' failed {attempts} times, skipping it: {e}")
+                    else:
+                        print(f"⚠️ Warm-up for table '{table}' failed ({attempts}/{WARM_UP_MAX_ATTEMPTS}): {e}")
+                        pending = True
+        self.is_warm = not pending
+
     def get_client(self) -> Optional["TeableDB"]:
         return self if self.is_authenticated else None
 
@@ -41,6 +119,17 @@ class TeableDB:
             "Content-Type": "application/json",
         }
 
+    def _http(self) -> httpx.Client:
+        # one pooled client per worker, so requests reuse keep-alive connections;
+        # httpx is imported here to keep it out of app import time
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+
+                    self._client = httpx.Client(timeout=settings.TEABLE_TIMEOUT_SECONDS)
+        return self._client
+
     def _request(
         self,
         method: str,
@@ -52,29 +141,42 @@ class TeableDB:
         if not self.base_url:
             raise RuntimeError("Teable base URL is not configured")
 
+        import httpx
+
         url = f"{self.base_url.rstrip('/')}{path}"
-        with httpx.Client(timeout=settings.TEABLE_TIMEOUT_SECONDS) as client:
-            response = client.request(method, url, headers=self._headers(), params=params, json=json)
-            response.raise_for_status()
-            if not response.content:
-                return {}
-            return response.json()
+        try:
+            response = self._http().request(method, url, headers=self._headers(), params=params, json=json)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            # only connect-level failures mean Teable is gone; a slow read/write
+            # (large scan, upload) must not take the whole worker offline
+            self.mark_disconnected()
+            raise
+        response.raise_for_status()
+        if not response.content:
+            return {}
+        return response.json()
 
     @staticmethod
-    def _record_to_flat(record: Dict[str, Any]) -> Dict[str, Any]:
+    def _record_cells(record: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """Flat (field, value) pairs of a Teable record, without copying it."""
         if "fields" in record and isinstance(record["fields"], dict):
-            normalized = dict(record["fields"])
-            normalized["id"] = record.get("id") or record.get("recordId")
-            normalized["created"] = record.get("createdTime") or record.get("created") or ""
-            normalized["updated"] = record.get("lastModifiedTime") or record.get("updated") or ""
-            return normalized
-
-        normalized = dict(record)
-        if "id" not in normalized and "recordId" in normalized:
-            normalized["id"] = normalized.get("recordId")
-        normalized.setdefault("created", normalized.get("createdTime", ""))
-        normalized.setdefault("updated", normalized.get("lastModifiedTime", ""))
-        return normalized
+            yield from record["fields"].items()
+            yield "id", record.get("id") or record.get("recordId")
+            yield "created", record.get("createdTime") or record.get("created") or ""
+            yield "updated", record.get("lastModifiedTime") or record.get("updated") or ""
+            return
+
+        yield from record.items()
+        if "id" not in record and "recordId" in record:
+            yield "id", record.get("recordId")
+        if "created" not in record:
+            yield "created", record.get("createdTime", "")
+        if "updated" not in record:
+            yield "updated", record.get("lastModifiedTime", "")
+
+    @classmethod
+    def _record_to_flat(cls, record: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(cls._record_cells(record))
 
     @staticmethod
     def _extract_records(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -100,48 +202,38 @@ class TeableDB:
                     return data[key]
         return fallback
 
-    @staticmethod
-    def _apply_filters(records: List[Dict[str, Any]], filters: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-        if not filters:
-            return records
-
-        def matches(record: Dict[str, Any], f: Dict[str, Any]) -> bool:
-            value = record.get(f["field"])
-            target = f["value"]
-            op = f["op"]
-
-            if op == "eq":
-                return value == target
-            if op == "neq":
-                return value != target
-            if op == "gt":
-                return value is not None and value > target
-            if op == "lt":
-                return value is not None and value < target
-            if op == "gte":
-                return value is not None and value >= target
-            if op == "lte":
-                return value is not None and value <= target
-            if op in ("like", "ilike"):
-                if value is None:
-                    return False
-                value_s = str(value)
-                target_s = str(target)
-                return target_s.lower() in value_s.lower() if op == "ilike" else target_s in value_s
-            return True
-
-        filtered = records
-        for item in filters:
-            filtered = [row for row in filtered if matches(row, item)]
-        return filtered
-
-    @staticmethod
-    def _apply_sort(records: List[Dict[str, Any]], sort: Optional[str]) -> List[Dict[str, Any]]:
-        if not sort:
-            return records
-        reverse = sort.startswith("-")
-        field = sort[1:] if reverse else sort
-        return sorted(records, key=lambda x: (x.get(field) is None, x.get(field)), reverse=reverse)
+    def _scan_cells(self, table_id: str) -> Iterator[Iterator[Tuple[str, Any]]]:
+        skip = 0
+        take = 1000
+
+        while True:
+            payload = self._request(
+                "GET",
+                f"/api/table/{table_id}/record",
+                params={"take": take, "skip": skip, "fieldKeyType": "name", "cellFormat": "json"},
+            )
+            records = self._extract_records(payload)
+            for item in records:
+                yield self._record_cells(item)
+
+            if len(records) < take:
+                break
+            skip += take
+
+    def scan_table(self, table: str) -> RowSet:
+        """Return all rows of a table, served from the shared cache when fresh."""
+        if table in UNCACHED_TABLES:
+            return RowSet.from_cells(self._scan_cells(self.resolve_table_id(table)))
+
+        cached = cache.get_table(table)
+        if cached is not None:
+            return cached
+
+        # a write during the scan bumps the generation and the (stale) scan is not stored
+        generation = cache.generation(table)
+        rows = RowSet.from_cells(self._scan_cells(self.resolve_table_id(table)))
+        cache.set_table(table, rows, generation=generation)
+        return rows
 
     def list_records(
         self,
@@ -157,40 +249,22 @@ class TeableDB:
         if full_list or sort or filters:
             # Teable filter/sort syntax can vary by API version, so we fetch in batches
             # and apply business-level filters/sort locally for API compatibility.
-            all_items: List[Dict[str, Any]] = []
-            skip = 0
-            take = min(max(per_page, 1), 1000)
-
-            while True:
-                payload = self._request(
-                    "GET",
-                    f"/api/table/{table_id}/record",
-                    params={"take": take, "skip": skip, "fieldKeyType": "name", "cellFormat": "json"},
-                )
-                records = self._extract_records(payload)
-                normalized_batch = [self._record_to_flat(item) for item in records]
-                all_items.extend(normalized_batch)
-
-                if len(records) < take:
-                    break
-                skip += take
-
-            all_items = self._apply_filters(all_items, filters)
-            all_items = self._apply_sort(all_items, sort)
+            # Rows stay columnar until the requested page is materialized.
+            rows = self.scan_table(table).filter(filters).sort(sort)
 
             if full_list:
                 return {
                     "page": 1,
-                    "perPage": len(all_items),
-                    "totalItems": len(all_items),
+                    "perPage": len(rows),
+                    "totalItems": len(rows),
                     "totalPages": 1,
-                    "items": all_items,
+                    "items": rows.to_dicts(),
                 }
 
-            total_items = len(all_items)
+            total_items = len(rows)
             start = (page - 1) * per_page
             end = start + per_page
-            paged = all_items[start:end]
+            paged = rows[start:end].to_dicts()
             total_pages = (total_items + per_page - 1) // per_page if per_page else 1
 
             return {
@@ -223,6 +297,7 @@ class TeableDB:
     def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         table_id = self.resolve_table_id(table)
         payload = self._request("POST", f"/api/table/{table_id}/record", json={"records": [{"fields": data}]})
+        cache.invalidate(table)
         records = self._extract_records(payload)
         if records:
             return self._record_to_flat(records[0])
@@ -232,6 +307,22 @@ class TeableDB:
             return self._record_to_flat(payload)
         raise RuntimeError("Teable create record returned empty response")
 
+    def get_record(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        import httpx
+
+        table_id = self.resolve_table_id(table)
+        try:
+            payload = self._request(
+                "GET",
+                f"/api/table/{table_id}/record/{record_id}",
+                params={"fieldKeyType": "name", "cellFormat": "json"},
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+        return self._record_to_flat(payload) if payload else None
+
     def update_record(self, table: str, record_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         table_id = self.resolve_table_id(table)
         payload = self._request(
@@ -239,19 +330,80 @@ class TeableDB:
             f"/api/table/{table_id}/record/{record_id}",
             json={"fields": data},
         )
+        cache.invalidate(table)
         return self._record_to_flat(payload)
 
     def delete_record(self, table: str, record_id: str) -> None:
         table_id = self.resolve_table_id(table)
         # common Teable bulk-delete shape
         self._request("DELETE", f"/api/table/{table_id}/record", json={"recordIds": [record_id]})
+        cache.invalidate(table)
 
-    def upload_file(self, filename: str, raw_data: bytes) -> Dict[str, Any]:
-        raise RuntimeError(
-            "Teable file upload is not configured in this project yet. "
-            "Use Teable Upload Attachment API and store returned token/url in the target field."
-        )
+    @staticmethod
+    def _iter_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def upload_file(
+        self,
+        filename: str,
+        stream: BinaryIO,
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Stream an attachment to Teable and return the attachment cell item.
+
+        Flow: signature -> chunked PUT of the file body -> notify.
+        The stream is never read into memory as a whole.
+        """
+        if not self.base_url:
+            raise RuntimeError("Teable base URL is not configured")
 
+        limit = settings.TEABLE_MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+        content_type = content_type or "application/octet-stream"
+
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        if size > limit:
+            raise UploadTooLargeError(limit)
+
+        signature = self._request(
+            "POST",
+            "/api/attachments/signature",
+            json={"contentType": content_type, "contentLength": size, "type": 1},
+        )
+        token = signature.get("token")
+        upload_url = signature.get("url")
+        if not token or not upload_url:
+            raise RuntimeError("Teable attachment signature returned empty response")
+
+        base = self.base_url.rstrip("/")
+        if upload_url.startswith("/"):
+            upload_url = f"{base}{upload_url}"
+
+        headers = {"Content-Type": content_type, "Content-Length": str(size)}
+        headers.update(signature.get("requestHeaders") or {})
+        if upload_url.startswith(base):
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        response = self._http().request(
+            signature.get("uploadMethod") or "PUT",
+            upload_url,
+            headers=headers,
+            content=self._iter_chunks(stream, settings.TEABLE_UPLOAD_CHUNK_BYTES),
+        )
+        response.raise_for_status()
+
+        attachment = self._request("POST", f"/api/attachments/notify/{token}")
+        if not attachment:
+            raise RuntimeError("Teable attachment notify returned empty response")
+        attachment.setdefault("token", token)
+        attachment["name"] = filename
+        return attachment
 
 # Global singleton used by API routers
 # import style: from backend.services.teable import db